@@ -1,33 +1,171 @@
 import cloudscraper
-from bs4 import BeautifulSoup, Comment
+import requests
+import lxml.html
+from lxml import etree
 import pandas as pd
 import time
 import schedule
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import gspread
-from google.oauth2.service_account import Credentials
 import logging
 import os
 import json
-from io import StringIO
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import orjson
+import hashlib
+import random
+import re
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# FBref er alltaf UTF-8; bætin eru þáttuð beint án þess að búa fyrst til Python streng
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# div-id á FBref innihalda tímabil og auðkenni sem breytast milli ára; forþýdd einu sinni
+RESULTS_DIV_RE = re.compile(r'^all_results\d{4}-\d{4}.*_overall$')
+SCHED_DIV_RE = re.compile(r'^all_sched')
+TABLE_ID_RE = re.compile(r'<table\b[^>]*?\bid="([^"]+)"')
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# Endurteknar hausraðir FBref í tbody (class="thead"/"over_header") síaðar út í einni XPath segð
+BODY_ROWS_XPATH = etree.XPath(f'./tbody/tr[not({_has_class("thead")} or {_has_class("over_header")})]')
+
+# Taflan er yfirleitt rótin eða beint barn umbúða-div; leitað er þar fyrst og svo í öllu undirtrénu
+_STATS_TABLE = _has_class('stats_table')
+TABLE_BY_ID_XPATHS = (
+    etree.XPath('self::table[@id=$id] | table[@id=$id]'),
+    etree.XPath('.//table[@id=$id]'),
+)
+STATS_TABLE_XPATHS = (
+    etree.XPath(f'self::table[{_STATS_TABLE}] | table[{_STATS_TABLE}]'),
+    etree.XPath(f'.//table[{_STATS_TABLE}]'),
+)
+
+class TokenBucket:
+    """Þráðöruggur token bucket: `rate` beiðnir á sekúndu að meðaltali, mest `capacity` í einni hrinu."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class PremierLeagueScraper:
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    MAX_RETRY_DELAY = 120
+    REQUEST_TIMEOUT = (5, 30)  # (tenging, lestur) í sekúndum
+    PAGE_TTL = 600  # sekúndur sem þáttuð síða er endurnýtt milli keyrslna
+    # Hækka þegar sniði þess sem skrifað er í Sheets er breytt (dálkheiti, tölutýpur, JSON reitir)
+    # svo vistuð fingraför falli úr gildi og öll worksheets séu skrifuð aftur
+    SHEET_FORMAT_VERSION = 2
+    COOKIE_KEYS = {'name', 'value', 'domain', 'path', 'expires', 'secure'}  # reitir sem vistaðir eru í cookies.json
+    SHEET_TITLES_TTL = 3600  # worksheet nöfn sótt aftur á klst. fresti ef einhverju var eytt handvirkt
+    # 30 mín. uppfærslur keyra aðeins frá hálftíma fyrir upphafsflaut þar til leik er örugglega lokið
+    MATCH_WINDOW_BEFORE = timedelta(minutes=30)
+    MATCH_WINDOW_AFTER = timedelta(hours=2, minutes=30)
+    # FBref töflur: worksheet -> (slóð, div id eða regex, table id)
+    FBREF_TABLES = {
+        'League_Table': ('/en/comps/9/Premier-League-Stats', RESULTS_DIV_RE, None),
+        'Player_Stats': ('/en/comps/9/stats/Premier-League-Stats', 'all_stats_standard', 'stats_standard'),
+        'Fixtures_Results': ('/en/comps/9/schedule/Premier-League-Fixtures', SCHED_DIV_RE, None),
+    }
+    FPL_BOOTSTRAP_URL = "https://fantasy.premierleague.com/api/bootstrap-static/"
+    FPL_FIXTURES_URL = "https://fantasy.premierleague.com/api/fixtures/"
+
     def __init__(self):
         self.base_url = "https://fbref.com"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # brotli pakkinn gerir requests kleift að afkóða 'br'
+            'Accept-Encoding': 'gzip, br, deflate',
         }
         self.session = cloudscraper.create_scraper()
         self.session.headers.update(self.headers)
+        # Keep-alive tengingar endurnýttar milli beiðna og þráða. Adapter cloudscraper (TLS/cipher stillingar
+        # fyrir Cloudflare) er haldið; aðeins pool-stærðinni er breytt.
+        for adapter in self.session.adapters.values():
+            adapter.init_poolmanager(connections=4, maxsize=16)
+        self._pages = {}
+        self._update_ts = None
+        self._fresh_after = None  # síður þáttaðar fyrir þennan tíma (monotonic) eru sóttar aftur
+        self._update_lock = threading.Lock()
+        self.last_run = None
+        self._kickoffs = None  # upphafstímar leikja (UTC) úr FPL fixtures; None = óþekkt
+        # Sheets leyfir 60 skrif-beiðnir á mínútu á notanda; höldum okkur vel undir því
+        self._sheets_limiter = TokenBucket(rate=50 / 60, capacity=10)
+        self._spreadsheets = {}
+        self._worksheet_titles = {}
+        # FBref lokar á vélar sem senda fleiri en ~10 beiðnir á mínútu
+        self._host_limiters = {'fbref.com': TokenBucket(rate=10 / 60, capacity=3)}
         self.setup_logging()
+        self.setup_http_cache()
         self.setup_google_sheets()
 
     def setup_logging(self):
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
+    def setup_http_cache(self):
+        """Hleður inn skyndiminni frá fyrri keyrslum: ETag/Last-Modified og fingraför worksheets."""
+        self.cache_dir = os.environ.get('PL_CACHE_DIR', '.cache')
+        self.http_cache_file = os.path.join(self.cache_dir, 'http_cache.json')
+        self.sheet_hashes_file = os.path.join(self.cache_dir, 'sheet_hashes.json')
+        self.cookies_file = os.path.join(self.cache_dir, 'cookies.json')
+        self._http_cache_lock = threading.Lock()
+        self.http_cache = self._load_json_cache(self.http_cache_file)
+        self.sheet_hashes = self._load_json_cache(self.sheet_hashes_file)
+        self._parsed_tables = {}
+        self._saved_cookies = self._load_cookies()
+        self.logger.info(f"💾 HTTP skyndiminni hlaðið: {len(self.http_cache)} síður, {len(self._saved_cookies)} kökur")
+
+    def _load_cookies(self):
+        """
+        Hleður vistuðum kökum inn í session. Cloudflare kökur (t.d. cf_clearance) endurnýttar svo ekki
+        þurfi að leysa áskorun eftir endurræsingu. Ógild skrá gefur tóma kökukrukku, ekki hrun.
+        """
+        cookies = self._load_json_cache(self.cookies_file) or []
+        if not isinstance(cookies, list):
+            self.logger.warning(f"⚠️ {self.cookies_file} er ekki listi af kökum, hunsa hana.")
+            return []
+        try:
+            for cookie in cookies:
+                if not isinstance(cookie, dict) or not {'name', 'value'} <= cookie.keys() <= self.COOKIE_KEYS:
+                    raise ValueError(f"ógild kaka: {cookie!r}")
+                self.session.cookies.set(**cookie)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gat ekki lesið kökur úr {self.cookies_file}: {e}")
+            self.session.cookies.clear()
+            return []
+        return cookies
+
+    def _load_json_cache(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gat ekki lesið {path}: {e}")
+            return {}
+
     def setup_google_sheets(self):
         try:
             self.logger.info("🔍 BYRJA Á GOOGLE SHEETS UPPSETNINGU...")
@@ -38,8 +176,8 @@ class PremierLeagueScraper:
                     "https://spreadsheets.google.com/feeds",
                     "https://www.googleapis.com/auth/drive"
                 ]
-                creds = Credentials.from_service_account_info(creds_info, scopes=scope)
-                self.gc = gspread.authorize(creds)
+                # Client heldur einni AuthorizedSession (með keep-alive tengipotti); aðgangslykill er endurnýjaður aðeins þegar hann rennur út
+                self.gc = gspread.service_account_from_dict(creds_info, scopes=scope)
                 self.logger.info("✅ GOOGLE SHEETS TENGING TÓKST!")
                 self.test_google_connection()
             else:
@@ -61,33 +199,301 @@ class PremierLeagueScraper:
             self.logger.error(f"💥 Villa við prófun: {e}")
             return False
 
+    # --------------------------- HTTP beiðnir ------------------------------- #
+    @staticmethod
+    def _retry_after(response):
+        """Les Retry-After haus (sekúndur eða HTTP-dagsetning) og skilar biðtíma í sekúndum."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def _request(self, url, max_attempts=5, base_delay=1.0, **kwargs):
+        """
+        GET beiðni með endurtekningum á 429/5xx svörum og tengivillum.
+        Virðir Retry-After ef þjónninn sendir hann, annars full-jitter exponential backoff.
+        """
+        kwargs.setdefault('timeout', self.REQUEST_TIMEOUT)
+        host = urlsplit(url).hostname or ''
+        limiter = self._host_limiters.get(host.removeprefix('www.'))
+        for attempt in range(max_attempts):
+            last_attempt = attempt == max_attempts - 1
+            backoff = random.uniform(0, min(60, base_delay * 2 ** attempt))
+            if limiter:
+                limiter.acquire()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                self.logger.warning(f"⚠️ Tengivilla ({url}): {e} — reyni aftur eftir {backoff:.1f}s")
+                time.sleep(backoff)
+                continue
+            if response.status_code not in self.RETRY_STATUSES or last_attempt:
+                return response
+            retry_after = self._retry_after(response)
+            if retry_after is not None and retry_after > self.MAX_RETRY_DELAY:
+                # Þjónninn biður um lengri bið en við viljum halda keyrslunni; hættum frekar en að lengja bannið
+                self.logger.error(
+                    f"❌ HTTP {response.status_code} ({url}) — Retry-After {retry_after:.0f}s er yfir "
+                    f"{self.MAX_RETRY_DELAY}s, gefst upp í þessari keyrslu"
+                )
+                return response
+            delay = retry_after if retry_after is not None else min(backoff, self.MAX_RETRY_DELAY)
+            self.logger.warning(f"⚠️ HTTP {response.status_code} ({url}) — reyni aftur eftir {delay:.1f}s")
+            time.sleep(delay)
+
+    # --------------------------- HTTP skyndiminni --------------------------- #
+    def _save_cookies(self):
+        """Vistar kökur session á disk ef þær hafa breyst frá síðustu vistun."""
+        cookies = [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'expires': c.expires, 'secure': c.secure}
+            for c in self.session.cookies
+        ]
+        if cookies == self._saved_cookies:
+            return
+        try:
+            self._write_atomic(self.cookies_file, json.dumps(cookies, indent=2).encode('utf-8'))
+            self._saved_cookies = cookies
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gat ekki vistað kökur: {e}")
+
+    def _cache_path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.html")
+
+    def _write_atomic(self, path, data):
+        """Skrifar bæti fyrst í .tmp skrá og endurnefnir svo hálfskrifuð skrá sjáist aldrei."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def fetch_page(self, url):
+        """
+        Sækir HTML síðu með skilyrtri beiðni (If-None-Match / If-Modified-Since).
+        Ef þjónninn svarar 304 er síðan lesin úr skyndiminni á disk í stað þess að hlaða henni niður aftur.
+        Skilar óafkóðuðum bætum sem eru þáttuð beint með HTML_PARSER.
+        """
+        meta = self.http_cache.get(url)
+        path = self._cache_path(url)
+        headers = {}
+        if meta and os.path.exists(path):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self._request(url, headers=headers)
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        self.logger.info(f"📡 HTTP Status: {response.status_code} ({url}, {encoding})")
+        if response.status_code == 304:
+            self.logger.info(f"♻️ Óbreytt síða, nota skyndiminni ({url})")
+            with open(path, 'rb') as f:
+                return f.read()
+        if response.status_code != 200:
+            return None
+
+        html = response.content
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            try:
+                with self._http_cache_lock:
+                    self._write_atomic(path, html)
+                    self.http_cache[url] = {'etag': etag, 'last_modified': last_modified}
+                    self._write_atomic(self.http_cache_file, json.dumps(self.http_cache, indent=2).encode('utf-8'))
+            except Exception as e:
+                self.logger.warning(f"⚠️ Gat ekki vistað {url} í skyndiminni: {e}")
+        return html
+
     # --------------------------- FBref hjálparföll --------------------------- #
+    def get_page(self, url, fresh_after=None):
+        """
+        Sækir og þáttar FBref síðu; þáttaða síðan er endurnýtt í PAGE_TTL sekúndur (t.d. þegar
+        tvær töflur eru á sömu síðu) nema hún hafi verið þáttuð fyrir fresh_after (time.monotonic).
+        FBref felur flestar töflur inni í HTML athugasemdum. Þær eru skráðar hér eftir id töflu og
+        id umlykjandi div, en aðeins þáttaðar þegar tafla úr þeim er sótt (sjá _comment_fragment).
+        """
+        page = self._pages.get(url)
+        if (page is not None and time.monotonic() - page['fetched_at'] < self.PAGE_TTL
+                and (fresh_after is None or page['fetched_at'] >= fresh_after)):
+            return page
+        html = self.fetch_page(url)
+        if html is None:
+            return None
+        root = lxml.html.fromstring(html, parser=HTML_PARSER)
+        comments = []
+        comment_divs = {}
+        comment_tables = {}
+        for comment in root.iter(etree.Comment):
+            text = comment.text or ''
+            if '<table' not in text:
+                continue
+            index = len(comments)
+            comments.append(text)
+            for table_id in TABLE_ID_RE.findall(text):
+                comment_tables.setdefault(table_id, index)
+            parent = next((div for div in comment.iterancestors('div') if div.get('id')), None)
+            if parent is not None:
+                comment_divs.setdefault(parent.get('id'), index)
+        page = {
+            'fetched_at': time.monotonic(),
+            'root': root,
+            'comments': comments,
+            'fragments': {},
+            'comment_divs': comment_divs,
+            'comment_tables': comment_tables,
+        }
+        self._pages[url] = page
+        return page
+
+    @staticmethod
+    def _comment_fragment(page, index):
+        """Þáttar athugasemd númer `index` í fyrsta sinn sem hún er notuð og man niðurstöðuna."""
+        fragment = page['fragments'].get(index)
+        if fragment is None:
+            fragment = lxml.html.fromstring(page['comments'][index])
+            page['fragments'][index] = fragment
+        return fragment
+
     def get_html_table(self, url, div_id=None, table_id=None):
+        """Finnur <table> á síðu; div_id má vera strengur eða forþýtt regex (t.d. RESULTS_DIV_RE)."""
         try:
-            response = self.session.get(url, timeout=30)
-            self.logger.info(f"📡 HTTP Status: {response.status_code} ({url})")
-            if response.status_code != 200:
+            page = self.get_page(url, fresh_after=self._fresh_after)
+            if page is None:
                 return None
-            soup = BeautifulSoup(response.text, 'html.parser')
-            if div_id:
-                div = soup.find('div', id=div_id)
-                comment = div.find(string=lambda text: isinstance(text, Comment)) if div else None
-                soup = BeautifulSoup(comment, 'html.parser') if comment else soup
-            table = soup.find('table', {'id': table_id}) if table_id else soup.find('table', {'class': 'stats_table'})
-            return table
+            index = None
+            if table_id and table_id in page['comment_tables']:
+                index = page['comment_tables'][table_id]
+            elif isinstance(div_id, re.Pattern):
+                index = next((i for key, i in page['comment_divs'].items() if div_id.match(key)), None)
+            elif div_id:
+                index = page['comment_divs'].get(div_id)
+            scope = page['root'] if index is None else self._comment_fragment(page, index)
+            lookups, variables = (TABLE_BY_ID_XPATHS, {'id': table_id}) if table_id else (STATS_TABLE_XPATHS, {})
+            for lookup in lookups:
+                tables = lookup(scope, **variables)
+                if tables:
+                    return tables[0]
+            return None
         except Exception as e:
             self.logger.error(f"💥 Villa við að sækja töflu: {e}")
             return None
 
+    @staticmethod
+    def _row_cells(tr):
+        """Texti allra reita í röð; reitur með colspan er endurtekinn eins og í pd.read_html."""
+        cells = []
+        for cell in tr:
+            if cell.tag not in ('th', 'td'):
+                continue
+            text = cell.text_content().strip()
+            try:
+                span = int(cell.get('colspan', 1))
+            except ValueError:
+                span = 1
+            cells.extend([text] * max(span, 1))
+        return cells
+
+    def _table_to_df(self, table):
+        """
+        Byggir DataFrame beint úr lxml <table> án þess að raðgera töfluna aftur í HTML fyrir pd.read_html.
+        Fjölþrepa dálkheiti eru sameinuð með '_' og endurteknar hausraðir FBref í tbody eru slepptar.
+        """
+        header_rows = table.xpath('./thead/tr')
+        if header_rows:
+            body_rows = BODY_ROWS_XPATH(table)
+        else:
+            all_rows = table.xpath('.//tr')
+            header_rows, body_rows = all_rows[:1], all_rows[1:]
+        levels = [self._row_cells(tr) for tr in header_rows]
+        width = max((len(level) for level in levels), default=0)
+
+        columns, seen = [], {}
+        for i in range(width):
+            parts = [level[i] for level in levels if i < len(level) and level[i]]
+            name = '_'.join(parts) or f"col_{i}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+
+        rows = []
+        for tr in body_rows:
+            cells = self._row_cells(tr)
+            if not any(cells):
+                continue
+            cells = cells[:width] + [''] * (width - len(cells))
+            rows.append([c if c else None for c in cells])
+
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        for c in df.columns:
+            cleaned = df[c].str.replace(',', '', regex=False)
+            numbers = pd.to_numeric(cleaned, errors='coerce')
+            if numbers.notna().sum() == cleaned.notna().sum():
+                # Heiltöludálkar með tómum reitum verða float64; Int64 heldur þeim sem heiltölum (29, ekki 29.0).
+                # Ákveðið út frá textanum svo aukastafadálkur (t.d. Pts/MP '3.00') haldist float þótt öll gildi séu heil.
+                if (numbers.dtype.kind == 'f' and numbers.notna().any()
+                        and not cleaned.str.contains('.', regex=False).any()):
+                    numbers = numbers.astype('Int64')
+                df[c] = numbers
+        return df
+
+    @staticmethod
+    def _table_digest(table):
+        return hashlib.sha1(etree.tostring(table)).hexdigest()
+
+    def table_frame(self, url, table):
+        """
+        DataFrame fyrir töflu, þáttuð aðeins ef innihald hennar hefur breyst frá síðustu keyrslu.
+        Fingrafar töflunnar er sett í df.attrs['content_hash'] svo update_google_sheets geti
+        sleppt worksheets sem eru óbreytt.
+        """
+        digest = self._table_digest(table)
+        cached = self._parsed_tables.get(url)
+        if cached is not None and cached[0] == digest:
+            self.logger.info(f"♻️ Tafla óbreytt, sleppi þáttun ({url})")
+            df = cached[1].copy()
+        else:
+            df = self._table_to_df(table)
+            self._parsed_tables[url] = (digest, df.copy())
+        df.attrs['content_hash'] = digest
+        return df
+
+    def _timestamp(self):
+        """Tímastimpill keyrslunnar; allar töflur í sömu full_update fá sama Last_Updated."""
+        return self._update_ts or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def fbref_frame(self, worksheet_name):
+        """Sækir FBref töflu skv. FBREF_TABLES og skilar DataFrame með Last_Updated, eða None."""
+        path, div_id, table_id = self.FBREF_TABLES[worksheet_name]
+        url = f"{self.base_url}{path}"
+        table = self.get_html_table(url, div_id=div_id, table_id=table_id)
+        if table is None:
+            return None
+        df = self.table_frame(url, table)
+        df['Last_Updated'] = self._timestamp()
+        return df
+
     def get_premier_league_table(self):
         self.logger.info("🏴 Sæki Premier League töflu...")
-        url = f"{self.base_url}/en/comps/9/Premier-League-Stats"
-        table = self.get_html_table(url, div_id='all_results2024-2025_9_overall')
-        if table:
-            df = pd.read_html(str(table))[0]
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join(col).strip() for col in df.columns.values]
-            df['Last_Updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = self.fbref_frame('League_Table')
+        if df is not None:
             self.logger.info(f"✅ PL tafla fundin: {len(df)} lið")
             return df
         self.logger.error("❌ Gat ekki fundið PL töflu.")
@@ -95,13 +501,8 @@ class PremierLeagueScraper:
 
     def get_player_stats(self):
         self.logger.info("⚽ Sæki leikmannastatistík (FBref)...")
-        url = f"{self.base_url}/en/comps/9/stats/Premier-League-Stats"
-        table = self.get_html_table(url, div_id='all_stats_standard', table_id='stats_standard')
-        if table:
-            df = pd.read_html(str(table))[0]
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join(col).strip() for col in df.columns.values]
-            df['Last_Updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = self.fbref_frame('Player_Stats')
+        if df is not None:
             self.logger.info(f"✅ Leikmenn fundnir (FBref): {len(df)}")
             return df
         self.logger.error("❌ Gat ekki fundið leikmannatöflu (FBref).")
@@ -109,11 +510,8 @@ class PremierLeagueScraper:
 
     def get_fixtures_and_results(self):
         self.logger.info("📅 Sæki leikjaupplýsingar (FBref)...")
-        url = f"{self.base_url}/en/comps/9/schedule/Premier-League-Fixtures"
-        table = self.get_html_table(url, div_id='all_sched_ks_3232_1')
-        if table:
-            df = pd.read_html(str(table))[0]
-            df['Last_Updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = self.fbref_frame('Fixtures_Results')
+        if df is not None:
             self.logger.info(f"✅ Leikir fundnir (FBref): {len(df)}")
             return df
         self.logger.error("❌ Gat ekki fundið leikjatöflu (FBref).")
@@ -123,14 +521,50 @@ class PremierLeagueScraper:
     def _json_get(self, url: str):
         """Örugg JSON beiðni með skýrri villumeðhöndlun."""
         try:
-            r = self.session.get(url, timeout=30)
+            r = self._request(url)
             self.logger.info(f"📡 HTTP Status: {r.status_code} ({url})")
             r.raise_for_status()
-            return r.json()
+            # orjson les bætin beint og er margfalt hraðara en json.loads
+            return orjson.loads(r.content)
         except Exception as e:
             self.logger.error(f"💥 Villa við JSON beiðni á {url}: {e}")
             return None
 
+    @staticmethod
+    def _records_frame(records):
+        """
+        Býr til DataFrame úr lista af JSON hlutum. json_normalize er margfalt hægara en
+        pd.DataFrame og þarf aðeins þegar einhver reitur er hreiðrað dict sem á að fletja út.
+        """
+        if any(isinstance(v, dict) for rec in records for v in rec.values()):
+            return pd.json_normalize(records)
+        return pd.DataFrame(records)
+
+    @staticmethod
+    def _json_digest(obj):
+        """Fingrafar JSON gagna (óháð röð lykla) svo óbreytt FPL gögn séu ekki skrifuð aftur."""
+        payload = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _parse_kickoffs(fixtures):
+        """Upphafstímar leikja úr FPL fixtures sem tímabeltismerkt datetime (UTC)."""
+        kickoffs = []
+        for fixture in fixtures:
+            if not isinstance(fixture, dict):
+                continue
+            kickoff = fixture.get('kickoff_time')
+            if not isinstance(kickoff, str) or not kickoff:
+                continue  # leikir sem á eftir að tímasetja eða ógild gildi
+            try:
+                when = datetime.fromisoformat(kickoff.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            kickoffs.append(when)
+        return kickoffs
+
     def get_fpl_data(self):
         """
         Sækir *öll* almenn FPL gögn (án innskráningar) og skilar sem dict af DataFrame-um.
@@ -140,23 +574,21 @@ class PremierLeagueScraper:
         """
         self.logger.info("🧩 Sæki FPL gögn (bootstrap-static, fixtures)...")
 
-        bootstrap_url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        fixtures_url = "https://fantasy.premierleague.com/api/fixtures/"
-
-        data = self._json_get(bootstrap_url)
-        fixtures = self._json_get(fixtures_url)
+        data = self._json_get(self.FPL_BOOTSTRAP_URL)
+        fixtures = self._json_get(self.FPL_FIXTURES_URL)
 
         if data is None:
             self.logger.error("❌ Engin FPL bootstrap gögn fengust.")
             return {}
 
         dfs = {}
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = self._timestamp()
 
         def dfize(obj, name):
             try:
-                df = pd.json_normalize(obj)
+                df = self._records_frame(obj)
                 df['Last_Updated'] = timestamp
+                df.attrs['content_hash'] = self._json_digest(obj)
                 dfs[name] = df
                 self.logger.info(f"✅ FPL {name}: {len(df)} raðir")
             except Exception as e:
@@ -185,14 +617,21 @@ class PremierLeagueScraper:
         total_players = data.get('total_players')
         if total_players is not None:
             df_total = pd.DataFrame([{'total_players': total_players, 'Last_Updated': timestamp}])
+            df_total.attrs['content_hash'] = self._json_digest(total_players)
             dfs['FPL_Total_Players'] = df_total
             self.logger.info("✅ FPL Total_Players bætt við")
 
         # Fixtures (allir leikir með FPL-ID, finished o.fl.)
         if fixtures is not None:
             try:
-                df_fixt = pd.json_normalize(fixtures)
+                self._kickoffs = self._parse_kickoffs(fixtures)
+            except Exception as e:
+                # Fyrri leikjadagskrá er haldið svo 30 mín. hliðið haldi áfram að virka
+                self.logger.warning(f"⚠️ Gat ekki lesið upphafstíma leikja úr fixtures: {e}")
+            try:
+                df_fixt = self._records_frame(fixtures)
                 df_fixt['Last_Updated'] = timestamp
+                df_fixt.attrs['content_hash'] = self._json_digest(fixtures)
                 dfs['FPL_Fixtures_API'] = df_fixt
                 self.logger.info(f"✅ FPL Fixtures: {len(df_fixt)} raðir")
             except Exception as e:
@@ -201,118 +640,340 @@ class PremierLeagueScraper:
         return dfs
 
     # --------------------------- Sheets hjálparföll ------------------------- #
-    def clean_data_for_sheets(self, data_list):
-        """Skiptir út NaN í tóman streng fyrir Google Sheets."""
-        cleaned = []
-        for row in data_list:
-            new_row = []
-            for item in row:
-                if pd.isna(item):
-                    new_row.append("")
-                else:
-                    new_row.append(item)
-            cleaned.append(new_row)
-        return cleaned
+    def sheet_values(self, data):
+        """Breytir DataFrame í lista af röðum (með dálkheitum) sem Sheets tekur við."""
+        # Tryggja að dálkheit séu strengir og unique
+        cols = [str(c) for c in data.columns.tolist()]
+        # Sumir JSON-reitir geta verið list/dict — varpa í streng fyrir Sheets.
+        # Aðeins object-dálkar geta geymt slíkt; tölu- og strengjadálkum er sleppt.
+        df = data
+        for i, dtype in enumerate(data.dtypes):
+            if dtype != object:
+                continue
+            col = data.iloc[:, i]
+            if not col.map(lambda x: isinstance(x, (list, dict))).any():
+                continue
+            if df is data:
+                df = data.copy()
+            df.isetitem(i, col.map(lambda x: json.dumps(x, ensure_ascii=False) if isinstance(x, (list, dict)) else x))
+        # NaN -> tómur strengur fyrir Google Sheets, í sömu umbreytingu og object-fylkið er búið til
+        return [cols] + df.to_numpy(dtype=object, na_value="").tolist()
 
-    def update_google_sheet(self, sheet_name, data, worksheet_name):
-        if self.gc is None:
-            self.logger.error("❌ Engin Google Sheets tenging.")
-            return
-        try:
-            try:
-                sheet = self.gc.open(sheet_name)
-            except gspread.SpreadsheetNotFound:
-                sheet = self.gc.create(sheet_name)
-                # Breyttu netfangi hér ef þú vilt deila með öðrum
-                sheet.share('your-email@example.com', perm_type='user', role='writer')
+    @staticmethod
+    def _a1_sheet(worksheet_name):
+        """Nafn worksheet í A1 rithætti, t.d. 'FPL_Events'."""
+        return "'" + worksheet_name.replace("'", "''") + "'"
 
+    def _sheets_call(self, func, *args, max_attempts=5, **kwargs):
+        """
+        Keyrir Sheets/Drive API kall í gegnum token bucket og reynir aftur á 429/5xx,
+        með Retry-After ef Google sendir hann, annars exponential backoff.
+        """
+        for attempt in range(max_attempts):
+            self._sheets_limiter.acquire()
             try:
-                worksheet = sheet.worksheet(worksheet_name)
-                worksheet.clear()
-            except gspread.WorksheetNotFound:
-                # vel stórt default pláss
-                worksheet = sheet.add_worksheet(title=worksheet_name, rows="5000", cols="200")
+                return func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = e.response.status_code
+                if status not in self.RETRY_STATUSES or attempt == max_attempts - 1:
+                    raise
+                retry_after = self._retry_after(e.response)
+                if retry_after is not None and retry_after > self.MAX_RETRY_DELAY:
+                    self.logger.error(
+                        f"❌ Sheets API {status} — Retry-After {retry_after:.0f}s er yfir "
+                        f"{self.MAX_RETRY_DELAY}s, gefst upp í þessari keyrslu"
+                    )
+                    raise
+                delay = retry_after if retry_after is not None else min(
+                    random.uniform(0, min(60, 2 ** attempt)), self.MAX_RETRY_DELAY
+                )
+                self.logger.warning(f"⚠️ Sheets API {status} — reyni aftur eftir {delay:.1f}s")
+                time.sleep(delay)
+
+    def open_spreadsheet(self, sheet_name):
+        """Opnar (eða býr til) spreadsheet; handfangið er geymt milli keyrslna svo gc.open leiti ekki í Drive í hvert sinn."""
+        sheet = self._spreadsheets.get(sheet_name)
+        if sheet is not None:
+            return sheet
+        try:
+            sheet = self._sheets_call(self.gc.open, sheet_name)
+        except gspread.SpreadsheetNotFound:
+            sheet = self.create_spreadsheet(sheet_name)
+        self._spreadsheets[sheet_name] = sheet
+        return sheet
 
+    def create_spreadsheet(self, sheet_name):
+        """
+        Býr til spreadsheet og deilir því. Hvorugt kallið er idempotent (endurtekning gæti búið til
+        annað eintak eða sent annan tölvupóst) og er því reynt einu sinni; ef svar týndist eftir að
+        skjalið var búið til er það opnað í stað þess að búa til afrit.
+        """
+        try:
+            sheet = self._sheets_call(self.gc.create, sheet_name, max_attempts=1)
+        except gspread.exceptions.APIError as e:
+            try:
+                sheet = self._sheets_call(self.gc.open, sheet_name)
+            except gspread.SpreadsheetNotFound:
+                raise e
+            self.logger.warning(f"⚠️ create skilaði villu en {sheet_name} er til: {e}")
+            return sheet
+        try:
+            # Breyttu netfangi hér ef þú vilt deila með öðrum
+            self._sheets_call(sheet.share, 'your-email@example.com', perm_type='user', role='writer', max_attempts=1)
+        except gspread.exceptions.APIError as e:
+            self.logger.warning(f"⚠️ Gat ekki deilt {sheet_name}: {e}")
+        return sheet
+
+    def worksheet_titles(self, sheet, sheet_name):
+        """Nöfn worksheets í spreadsheet, geymd í SHEET_TITLES_TTL og uppfærð þegar ný eru búin til."""
+        cached = self._worksheet_titles.get(sheet_name)
+        if cached is not None and time.monotonic() - cached[0] < self.SHEET_TITLES_TTL:
+            return cached[1]
+        titles = {ws.title for ws in self._sheets_call(sheet.worksheets)}
+        self._worksheet_titles[sheet_name] = (time.monotonic(), titles)
+        return titles
+
+    def add_worksheets(self, sheet, sheet_name, titles):
+        """
+        Býr til öll ný worksheets í einni batch_update beiðni (vel stórt default pláss).
+        addSheet er ekki idempotent og er því ekki endurtekið; ef svar týndist eftir að þjónninn
+        bjó blöðin til eru nöfnin sótt aftur og haldið áfram ef þau eru öll komin.
+        """
+        try:
+            self._sheets_call(sheet.batch_update, {'requests': [
+                {'addSheet': {'properties': {'title': name, 'gridProperties': {'rowCount': 5000, 'columnCount': 200}}}}
+                for name in titles
+            ]}, max_attempts=1)
+        except gspread.exceptions.APIError as e:
+            self._worksheet_titles.pop(sheet_name, None)
+            if not set(titles) <= self.worksheet_titles(sheet, sheet_name):
+                raise
+            self.logger.warning(f"⚠️ addSheet skilaði villu en worksheets eru til: {e}")
+        else:
+            self.worksheet_titles(sheet, sheet_name).update(titles)
+            self.logger.info(f"🆕 Bjó til worksheets: {', '.join(titles)}")
+
+    def _forget_spreadsheet(self, sheet_name):
+        """Hendir geymdu handfangi og worksheet nöfnum svo næsta keyrsla sæki þau upp á nýtt."""
+        self._spreadsheets.pop(sheet_name, None)
+        self._worksheet_titles.pop(sheet_name, None)
+
+    def update_google_sheets(self, sheet_name, frames):
+        """
+        Uppfærir mörg worksheets í einni lotu: ein values_batch_clear og ein values_batch_update
+        beiðni í stað clear() + update() fyrir hvert worksheet.
+        """
+        if self.gc is None:
+            self.logger.error("❌ Engin Google Sheets tenging.")
+            return
+        pending = {}
+        for worksheet_name, data in frames.items():
             if data is not None and not data.empty:
-                # Tryggja að dálkheit séu strengir og unique
-                cols = [str(c) for c in data.columns.tolist()]
-                # Sumir JSON-reitir geta verið list/dict — varpa í streng fyrir Sheets
-                df = data.copy()
-                for c in df.columns:
-                    df[c] = df[c].apply(lambda x: json.dumps(x, ensure_ascii=False) if isinstance(x, (list, dict)) else x)
-
-                data_list = [cols] + df.values.tolist()
-                cleaned_data = self.clean_data_for_sheets(data_list)
-                try:
-                    worksheet.update('A1', cleaned_data)
-                    self.logger.info(f"✅ Uppfærði {worksheet_name} með {len(df)} röðum.")
-                except Exception as e:
-                    self.logger.error(f"💥 Villa við uppfærslu á worksheet.update fyrir {worksheet_name}: {e}")
+                pending[worksheet_name] = data
             else:
                 self.logger.warning(f"⚠️ Engin gögn til að uppfæra í {worksheet_name}.")
+        if not pending:
+            return
+        try:
+            sheet = self.open_spreadsheet(sheet_name)
+            existing = self.worksheet_titles(sheet, sheet_name)
+            for worksheet_name, data in list(pending.items()):
+                content_hash = data.attrs.get('content_hash')
+                written_hash = self.sheet_hashes.get(self._sheet_hash_key(sheet_name, worksheet_name))
+                if worksheet_name in existing and content_hash and written_hash == self._versioned_hash(content_hash):
+                    self.logger.info(f"♻️ {worksheet_name} óbreytt, sleppi uppfærslu.")
+                    del pending[worksheet_name]
+            missing = [name for name in pending if name not in existing]
+            if missing:
+                self.add_worksheets(sheet, sheet_name, missing)
         except Exception as e:
             self.logger.error(f"💥 Villa við að nálgast eða búa til sheet/worksheet: {e}")
+            self._forget_spreadsheet(sheet_name)
+            return
+        if not pending:
+            return
+
+        try:
+            self._sheets_call(sheet.values_batch_clear, body={'ranges': [self._a1_sheet(name) for name in pending]})
+            self._sheets_call(sheet.values_batch_update, {
+                'valueInputOption': 'RAW',
+                'data': [
+                    {'range': f"{self._a1_sheet(name)}!A1", 'values': self.sheet_values(df)}
+                    for name, df in pending.items()
+                ],
+            })
+            for name, df in pending.items():
+                self.logger.info(f"✅ Uppfærði {name} með {len(df)} röðum.")
+        except Exception as e:
+            self.logger.error(f"💥 Villa við values_batch_update fyrir {', '.join(pending)}: {e}")
+            # T.d. worksheet eytt handvirkt — sækjum stöðuna upp á nýtt í næstu keyrslu
+            self._forget_spreadsheet(sheet_name)
+            return
+        self._save_sheet_hashes(sheet_name, pending)
+
+    @staticmethod
+    def _sheet_hash_key(sheet_name, worksheet_name):
+        """Lykill í sheet_hashes: sama worksheet nafn í öðru spreadsheet er annað worksheet."""
+        return f"{sheet_name}/{worksheet_name}"
+
+    def _versioned_hash(self, content_hash):
+        """Fingrafar gagna ásamt útgáfu skrifsniðs; sniðbreyting þvingar endurskrift þó gögnin séu óbreytt."""
+        return f"v{self.SHEET_FORMAT_VERSION}:{content_hash}"
+
+    def _save_sheet_hashes(self, sheet_name, written):
+        """Man fingraför nýskrifaðra worksheets (líka milli endurræsinga)."""
+        for name, df in written.items():
+            key = self._sheet_hash_key(sheet_name, name)
+            content_hash = df.attrs.get('content_hash')
+            if content_hash:
+                self.sheet_hashes[key] = self._versioned_hash(content_hash)
+            else:
+                self.sheet_hashes.pop(key, None)
+        # Færslur á eldra sniði (lykill án spreadsheet nafns) passa aldrei lengur
+        for key in [key for key in self.sheet_hashes if '/' not in key]:
+            del self.sheet_hashes[key]
+        try:
+            self._write_atomic(self.sheet_hashes_file, json.dumps(self.sheet_hashes, indent=2).encode('utf-8'))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gat ekki vistað fingraför worksheets: {e}")
+
+    def update_google_sheet(self, sheet_name, data, worksheet_name):
+        self.update_google_sheets(sheet_name, {worksheet_name: data})
 
     # --------------------------- Keyrsluföll ------------------------------- #
-    def full_update(self):
+    def collect_frames(self):
+        """Sækir FBref og FPL gögn samhliða og skilar dict af worksheet-nafni -> DataFrame."""
+        fbref_jobs = {
+            "League_Table": self.get_premier_league_table,
+            "Player_Stats": self.get_player_stats,
+            "Fixtures_Results": self.get_fixtures_and_results,
+        }
+        frames = {}
+        with ThreadPoolExecutor(max_workers=len(fbref_jobs) + 1) as executor:
+            futures = {executor.submit(job): ws_name for ws_name, job in fbref_jobs.items()}
+            fpl_future = executor.submit(self.get_fpl_data)
+            for future in as_completed(futures):
+                ws_name = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    self.logger.error(f"💥 Villa við að sækja {ws_name}: {e}")
+                    continue
+                if df is not None:
+                    frames[ws_name] = df
+
+            # FPL (nýtt!)
+            try:
+                frames.update(fpl_future.result())
+            except Exception as e:
+                self.logger.error(f"💥 Villa við að sækja FPL gögn: {e}")
+        return frames
+
+    def full_update(self, force_refresh=False):
+        """
+        Keyrir eina uppfærslu; sleppir ef önnur er þegar í gangi (t.d. upphafskeyrslan í bakgrunni).
+        Með force_refresh eru allar síður sóttar aftur (skilyrt GET) þó þáttuð útgáfa sé innan PAGE_TTL.
+        """
+        if not self._update_lock.acquire(blocking=False):
+            self.logger.warning("⏳ Uppfærsla þegar í gangi, sleppi þessari keyrslu.")
+            return
+        try:
+            self._full_update(force_refresh)
+        finally:
+            self._update_lock.release()
+
+    def _full_update(self, force_refresh=False):
         self.logger.info("🚀 Byrja fulla uppfærslu...")
-        if not self.test_google_connection():
+        # Tengingin er prófuð við ræsingu; raunverulegar auðkenningarvillur koma fram í Sheets köllunum sjálfum
+        if self.gc is None:
             self.logger.error("❌ Engin virk Google tenging.")
             return
 
         sheet_name = "PL_Fantasy_Data"
+        # Einn tímastimpill fyrir alla keyrsluna
+        self._update_ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Síða sem tvær töflur deila er samt aðeins sótt einu sinni í þvingaðri keyrslu
+        self._fresh_after = time.monotonic() if force_refresh else None
+        try:
+            frames = self.collect_frames()
+        finally:
+            self._update_ts = None
+            self._fresh_after = None
+            self._save_cookies()
 
-        # FBref
-        league = self.get_premier_league_table()
-        players = self.get_player_stats()
-        fixtures = self.get_fixtures_and_results()
-
-        if league is not None:
-            self.update_google_sheet(sheet_name, league, "League_Table")
-        if players is not None:
-            self.update_google_sheet(sheet_name, players, "Player_Stats")
-        if fixtures is not None:
-            self.update_google_sheet(sheet_name, fixtures, "Fixtures_Results")
-
-        # FPL (nýtt!)
-        fpl_dfs = self.get_fpl_data()
-        for ws_name, df in fpl_dfs.items():
-            self.update_google_sheet(sheet_name, df, ws_name)
+        # Öll worksheets eru skrifuð í einni Sheets lotu
+        self.update_google_sheets(sheet_name, frames)
 
+        self.last_run = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.logger.info("✅ Full uppfærsla lokið!")
 
     def run_once(self):
         self.full_update()
 
+    def in_match_window(self, now=None):
+        """Satt ef leikur er í gangi eða að hefjast. Ef leikjadagskrá er óþekkt er alltaf keyrt."""
+        if self._kickoffs is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        return any(
+            kickoff - self.MATCH_WINDOW_BEFORE <= now <= kickoff + self.MATCH_WINDOW_AFTER
+            for kickoff in self._kickoffs
+        )
+
+    def match_window_update(self):
+        """30 mín. uppfærsla sem keyrir aðeins í kringum leiki; utan þeirra breytast gögnin varla."""
+        if not self.in_match_window():
+            self.logger.info("⏸️ Enginn leikur í gangi, sleppi 30 mín. uppfærslu.")
+            return
+        self.full_update()
+
     def start_scheduler(self):
-        schedule.every(30).minutes.do(self.full_update)
-        schedule.every().day.at("08:00").do(self.full_update)
+        schedule.every(30).minutes.do(self.match_window_update)
+        # Daglega keyrslan endurnýjar alltaf síðurnar, þó 30 mín. keyrsla hafi nýlega þáttað þær
+        schedule.every().day.at("08:00").do(self.full_update, force_refresh=True)
         self.logger.info("⏰ Scheduler settur upp.")
-        self.full_update()
+        # Fyrsta keyrsla fer af stað strax í bakgrunni svo hún tefji ekki ræsingu
+        threading.Thread(target=self.full_update, daemon=True).start()
+        # Sofið nákvæmlega fram að næsta verki í stað fastrar 60 sek. könnunar
         while True:
             schedule.run_pending()
-            time.sleep(60)
+            idle = schedule.idle_seconds()
+            time.sleep(60 if idle is None else max(1, idle))
 
 # --------------------------- Einfaldur vefþjónn ---------------------------- #
-def run_web_server():
+STATUS_PAGE = """<html>
+<head><title>PL Scraper</title></head>
+<body>
+    <h1>✅ PL Scraper í gangi</h1>
+    <p>Síðast keyrt: {last_run}</p>
+</body>
+</html>
+"""
+
+
+def run_web_server(scraper=None):
+    # Síðan er aðeins kóðuð upp á nýtt þegar ný keyrsla hefur klárast. (last_run, bytes) er
+    # skipt út í einu lagi svo samhliða beiðnir sjái aldrei ósamstæð gildi.
+    cache = {'page': (object(), b'')}
+
     class Handler(SimpleHTTPRequestHandler):
         def do_GET(self):
+            last_run = scraper.last_run if scraper is not None else None
+            cached_run, body = cache['page']
+            if cached_run != last_run:
+                body = STATUS_PAGE.format(last_run=last_run or 'ekki enn').encode('utf-8')
+                cache['page'] = (last_run, body)
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            html = f"""
-            <html>
-            <head><title>PL Scraper</title></head>
-            <body>
-                <h1>✅ PL Scraper í gangi</h1>
-                <p>Síðast keyrt: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            </body>
-            </html>
-            """
-            self.wfile.write(html.encode('utf-8'))
+            self.wfile.write(body)
 
     port = int(os.environ.get("PORT", 8000))
-    server = HTTPServer(('0.0.0.0', port), Handler)
+    # Hver beiðni í eigin þræði svo hæg tenging (t.d. health probe) tefji ekki aðrar
+    server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
     thread = threading.Thread(target=server.serve_forever)
     thread.daemon = True
     thread.start()
@@ -324,7 +985,7 @@ def main():
     scraper = PremierLeagueScraper()
     if os.environ.get('RENDER') or os.environ.get('RAILWAY_ENVIRONMENT'):
         print("☁️ Production mode")
-        run_web_server()
+        run_web_server(scraper)
         scraper.start_scheduler()
     else:
         print("💻 Development mode")
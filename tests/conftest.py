@@ -0,0 +1,20 @@
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """Scraper án Google tengingar, með skyndiminni í tímabundinni möppu."""
+    monkeypatch.setenv('PL_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('GOOGLE_CREDENTIALS_JSON', raising=False)
+    monkeypatch.setattr(main.time, 'sleep', lambda seconds: None)
+    s = main.PremierLeagueScraper()
+    s.logger = logging.getLogger('test')
+    return s
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize('payload', [
+    {'cf_clearance': 'abc'},
+    ['cf_clearance'],
+    [{'name': 'cf_clearance'}],
+    [{'name': 'cf_clearance', 'value': 'abc', 'rest': {}}],
+    'ekki json',
+])
+def test_corrupt_cookie_file_falls_back_to_empty_jar(tmp_path, monkeypatch, payload):
+    monkeypatch.setenv('PL_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('GOOGLE_CREDENTIALS_JSON', raising=False)
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    (tmp_path / 'cookies.json').write_text(text, encoding='utf-8')
+    s = main.PremierLeagueScraper()
+    assert s._saved_cookies == []
+    assert len(s.session.cookies) == 0
+
+
+def test_saved_cookies_round_trip(scraper):
+    scraper.session.cookies.set('cf_clearance', 'abc', domain='.fbref.com', path='/')
+    scraper._save_cookies()
+    restored = main.PremierLeagueScraper()
+    assert restored.session.cookies.get('cf_clearance', domain='.fbref.com') == 'abc'
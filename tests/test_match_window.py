@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+import main
+
+
+def test_parse_kickoffs_skips_malformed_entries():
+    kickoffs = main.PremierLeagueScraper._parse_kickoffs([
+        {'kickoff_time': '2026-10-18T14:00:00Z'},
+        {'kickoff_time': '2026-10-18T16:30:00'},  # án tímabeltis
+        {'kickoff_time': None},
+        {'kickoff_time': 1729260000},
+        {'kickoff_time': 'ekki dagsetning'},
+        {},
+        'ekki dict',
+        None,
+    ])
+    assert kickoffs == [
+        datetime(2026, 10, 18, 14, 0, tzinfo=timezone.utc),
+        datetime(2026, 10, 18, 16, 30, tzinfo=timezone.utc),
+    ]
+
+
+def test_in_match_window_unknown_schedule_always_runs(scraper):
+    scraper._kickoffs = None
+    assert scraper.in_match_window()
+
+
+def test_in_match_window_bounds(scraper):
+    scraper._kickoffs = main.PremierLeagueScraper._parse_kickoffs([{'kickoff_time': '2026-10-18T14:00:00Z'}])
+    at = lambda text: datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+    assert not scraper.in_match_window(at('2026-10-18T13:29:00'))
+    assert scraper.in_match_window(at('2026-10-18T13:30:00'))
+    assert scraper.in_match_window(at('2026-10-18T16:30:00'))
+    assert not scraper.in_match_window(at('2026-10-18T16:31:00'))
+
+
+def test_in_match_window_accepts_naive_now(scraper):
+    scraper._kickoffs = main.PremierLeagueScraper._parse_kickoffs([{'kickoff_time': '2026-10-18T14:00:00Z'}])
+    assert scraper.in_match_window(datetime(2026, 10, 18, 15, 0))
+    scraper._kickoffs = []
+    assert not scraper.in_match_window(datetime(2026, 10, 18, 15, 0))
+
+
+def test_bad_fixtures_keep_previous_kickoffs_and_other_sheets(scraper, monkeypatch):
+    previous = main.PremierLeagueScraper._parse_kickoffs([{'kickoff_time': '2026-10-18T14:00:00Z'}])
+    scraper._kickoffs = previous
+    payloads = {
+        scraper.FPL_BOOTSTRAP_URL: {'teams': [{'id': 1, 'name': 'ARS'}]},
+        scraper.FPL_FIXTURES_URL: 42,  # ekki listi
+    }
+    monkeypatch.setattr(scraper, '_json_get', payloads.get)
+    dfs = scraper.get_fpl_data()
+    assert 'FPL_Teams' in dfs
+    assert scraper._kickoffs == previous
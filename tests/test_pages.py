@@ -0,0 +1,31 @@
+import time
+from pathlib import Path
+
+HTML = (Path(__file__).parent / 'fixtures' / 'stats_table.html').read_bytes()
+
+
+def counting_fetch(scraper, monkeypatch):
+    calls = []
+
+    def fetch_page(url):
+        calls.append(url)
+        return HTML
+
+    monkeypatch.setattr(scraper, 'fetch_page', fetch_page)
+    return calls
+
+
+def test_parsed_page_is_reused_within_ttl(scraper, monkeypatch):
+    calls = counting_fetch(scraper, monkeypatch)
+    scraper.get_html_table('https://fbref.com/a', table_id='stats_standard')
+    scraper.get_html_table('https://fbref.com/a', table_id='stats_standard')
+    assert len(calls) == 1
+
+
+def test_forced_cycle_refetches_each_page_once(scraper, monkeypatch):
+    calls = counting_fetch(scraper, monkeypatch)
+    scraper.get_html_table('https://fbref.com/a', table_id='stats_standard')
+    scraper._fresh_after = time.monotonic()
+    scraper.get_html_table('https://fbref.com/a', table_id='stats_standard')
+    scraper.get_html_table('https://fbref.com/a', table_id='stats_standard')
+    assert len(calls) == 2
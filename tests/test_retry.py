@@ -0,0 +1,45 @@
+import gspread
+import pytest
+import requests
+
+
+def make_response(status, headers=None, body=b''):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+def test_request_gives_up_on_long_retry_after(scraper, monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return make_response(429, {'Retry-After': '3600'})
+
+    monkeypatch.setattr(scraper.session, 'get', fake_get)
+    response = scraper._request('https://example.com/page')
+    assert response.status_code == 429
+    assert len(calls) == 1
+
+
+def test_request_honours_short_retry_after(scraper, monkeypatch):
+    responses = iter([make_response(503, {'Retry-After': '5'}), make_response(200)])
+    slept = []
+    monkeypatch.setattr(scraper.session, 'get', lambda url, **kwargs: next(responses))
+    monkeypatch.setattr('main.time.sleep', slept.append)
+    assert scraper._request('https://example.com/page').status_code == 200
+    assert slept == [5.0]
+
+
+def test_sheets_call_gives_up_on_long_retry_after(scraper):
+    calls = []
+
+    def rate_limited():
+        calls.append(1)
+        raise gspread.exceptions.APIError(make_response(429, {'Retry-After': '3600'}, b'{}'))
+
+    with pytest.raises(gspread.exceptions.APIError):
+        scraper._sheets_call(rate_limited)
+    assert len(calls) == 1
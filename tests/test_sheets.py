@@ -0,0 +1,140 @@
+import gspread
+import pandas as pd
+import requests
+
+
+class FakeWorksheet:
+    def __init__(self, title):
+        self.title = title
+
+
+class FakeSpreadsheet:
+    def __init__(self, titles=()):
+        self.titles = set(titles)
+        self.written = []
+
+    def worksheets(self):
+        return [FakeWorksheet(title) for title in self.titles]
+
+    def batch_update(self, body):
+        for request in body['requests']:
+            self.titles.add(request['addSheet']['properties']['title'])
+
+    def values_batch_clear(self, body=None):
+        pass
+
+    def values_batch_update(self, body):
+        self.written.extend(item['range'] for item in body['data'])
+
+
+class FakeClient:
+    def __init__(self):
+        self.spreadsheets = {}
+
+    def open(self, name):
+        return self.spreadsheets.setdefault(name, FakeSpreadsheet())
+
+
+def api_error(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    return gspread.exceptions.APIError(response)
+
+
+def frame(content_hash='abc'):
+    df = pd.DataFrame({'Squad': ['Arsenal'], 'Pts': [74]})
+    df.attrs['content_hash'] = content_hash
+    return df
+
+
+def test_unchanged_sheet_is_skipped(scraper):
+    scraper.gc = FakeClient()
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    assert scraper.gc.spreadsheets['PL'].written == ["'League_Table'!A1"]
+
+
+def test_format_version_bump_forces_rewrite(scraper, monkeypatch):
+    scraper.gc = FakeClient()
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    monkeypatch.setattr(type(scraper), 'SHEET_FORMAT_VERSION', scraper.SHEET_FORMAT_VERSION + 1)
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    assert len(scraper.gc.spreadsheets['PL'].written) == 2
+
+
+def test_hashes_are_per_spreadsheet(scraper):
+    scraper.gc = FakeClient()
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    scraper.update_google_sheets('PL_Test', {'League_Table': frame()})
+    assert scraper.gc.spreadsheets['PL_Test'].written == ["'League_Table'!A1"]
+
+
+class FlakySpreadsheet(FakeSpreadsheet):
+    """addSheet tekst á þjóninum en svarið týnist (502); endurtekning myndi gefa 'already exists'."""
+
+    def __init__(self):
+        super().__init__()
+        self.add_calls = 0
+
+    def batch_update(self, body):
+        self.add_calls += 1
+        if self.add_calls > 1:
+            raise AssertionError('addSheet endurtekið')
+        super().batch_update(body)
+        raise api_error(502)
+
+
+def test_add_sheet_is_not_retried_and_lost_response_is_tolerated(scraper):
+    scraper.gc = FakeClient()
+    sheet = scraper.gc.spreadsheets['PL'] = FlakySpreadsheet()
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    assert sheet.add_calls == 1
+    assert sheet.written == ["'League_Table'!A1"]
+
+
+class LostCreateClient:
+    """create tekst á Drive en svarið týnist (503); endurtekning myndi búa til annað eintak."""
+
+    def __init__(self):
+        self.spreadsheets = {}
+        self.create_calls = 0
+        self.share_calls = 0
+
+    def open(self, name):
+        if name not in self.spreadsheets:
+            raise gspread.SpreadsheetNotFound(name)
+        return self.spreadsheets[name]
+
+    def create(self, name):
+        self.create_calls += 1
+        sheet = self.spreadsheets[name] = FakeSpreadsheet()
+        sheet.share = self.share
+        raise api_error(503)
+
+    def share(self, *args, **kwargs):
+        self.share_calls += 1
+        raise api_error(503)
+
+
+def test_create_is_not_retried_and_lost_response_is_tolerated(scraper):
+    scraper.gc = LostCreateClient()
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    assert scraper.gc.create_calls == 1
+    assert scraper.gc.spreadsheets['PL'].written == ["'League_Table'!A1"]
+
+
+def test_share_is_attempted_once(scraper):
+    client = LostCreateClient()
+
+    def create(name):
+        client.create_calls += 1
+        sheet = client.spreadsheets[name] = FakeSpreadsheet()
+        sheet.share = client.share
+        return sheet
+
+    client.create = create
+    scraper.gc = client
+    scraper.update_google_sheets('PL', {'League_Table': frame()})
+    assert client.share_calls == 1
+    assert client.spreadsheets['PL'].written == ["'League_Table'!A1"]